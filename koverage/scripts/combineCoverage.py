@@ -15,6 +15,9 @@ import os
 import subprocess
 
 
+logger = logging.getLogger(__name__)
+
+
 def collect_coverage_stats(input_file):
     """Combine the mapped coverage stats for all samples.
 
@@ -97,9 +100,9 @@ def main(input_file, output_file, log_file, **kwargs):
     #         ]
     #     )
     logging.basicConfig(filename=log_file, filemode="w", level=logging.DEBUG)
-    logging.debug("Collecting combined coverage stats")
+    logger.debug("Collecting combined coverage stats")
     all_coverage = collect_coverage_stats(input_file)
-    logging.debug("Printing all sample coverage")
+    logger.debug("Printing all sample coverage")
     print_sample_coverage(output_file, all_coverage)
 
 
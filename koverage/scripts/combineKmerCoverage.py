@@ -11,74 +11,92 @@ This script will take the kmer-based coverage information from each samples' cov
 
 
 import logging
-import gzip
 import os
 import subprocess
+import pandas as pd
+import zstandard as zstd
 
+try:
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
 
-def collect_kmer_coverage_stats(input_file):
+
+logger = logging.getLogger(__name__)
+
+
+def collect_kmer_coverage_stats(input_file, chunk_size=1000000):
     """Combine the kmer coverage stats for all samples.
 
     Args:
         input_file (str): Text TSV file (Sample\tContig\tSum\tMean\tMedian\tHitrate\tVariance)
+        chunk_size (int): Number of lines to read and sum at a time
 
     Returns:
-        allCoverage (dict):
-            - key (str): contig ID
-            - value (dict):
-                - sum (int): sum of kmer hits
-                - mean (float): mean kmer depth
-                - median (float): median kmer depth
+        allCoverage (DataFrame):
+            - index (str): contig ID
+            - Sum (float): sum of kmer hits
+            - Mean (float): mean kmer depth
+            - Median (float): median kmer depth
     """
-    allCoverage = {}
-    with gzip.open(input_file, "rt") as infh:
-        infh.readline()
-        for line in infh:
-            l = line.strip().split()
-            try:
-                assert type(allCoverage[l[1]]) is dict
-            except (AssertionError, KeyError):
-                allCoverage[l[1]] = {"sum": 0, "mean": 0, "median": 0}
-            allCoverage[l[1]]["sum"] += float(l[2])
-            allCoverage[l[1]]["mean"] += float(l[3])
-            allCoverage[l[1]]["median"] += float(l[4])
+    allCoverage = pd.DataFrame(
+        columns=["Sum", "Mean", "Median"],
+        index=pd.Index([], name="Contig", dtype=str),
+        dtype="float64",
+    )
+    with gzip.open(input_file, "rb") as infh:
+        reader = pd.read_csv(
+            infh,
+            sep="\t",
+            header=0,
+            usecols=[1, 2, 3, 4],
+            names=["Contig", "Sum", "Mean", "Median"],
+            dtype={
+                "Contig": str,
+                "Sum": "float64",
+                "Mean": "float64",
+                "Median": "float64",
+            },
+            na_filter=False,
+            chunksize=chunk_size,
+        )
+        for chunk in reader:
+            allCoverage = allCoverage.add(
+                chunk.groupby("Contig", sort=False).sum(), fill_value=0
+            )
     return allCoverage
 
 
-def print_kmer_coverage(allCoverage, output_file, lines_per_batch=1000):
+def print_kmer_coverage(allCoverage, output_file, lines_per_batch=1000, threads=1):
     """Print the combined kmer coverage statistics from collect_kmer_coverage_stats().
 
     Args:
-        output_file (str): Gzipped Text TSV filepath for writing
-        allCoverage (dict):
-            - key (str): contig ID
-            - value (dict):
-                - sum (int): sum of kmer hits
-                - mean (float): mean kmer depth
-                - median (float): median kmer depth
+        output_file (str): Zstandard-compressed Text TSV filepath for writing
+        allCoverage (DataFrame):
+            - index (str): contig ID
+            - Sum (float): sum of kmer hits
+            - Mean (float): mean kmer depth
+            - Median (float): median kmer depth
         lines_per_batch (int): Number of lines to compress and write at a time
+        threads (int): Number of threads for compression
     """
-    with gzip.open(output_file, "wt", compresslevel=1) as file:
-        batch = ["Contig\tSum\tMean\tMedian"]
-        for contig in sorted(allCoverage.keys()):
-            batch.append(
-                "\t".join(
-                    [
-                        contig,
-                        "{:.{}g}".format(allCoverage[contig]["sum"], 4),
-                        "{:.{}g}".format(allCoverage[contig]["mean"], 4),
-                        "{:.{}g}".format(allCoverage[contig]["median"], 4),
-                    ]
-                )
-            )
-            if len(batch) >= lines_per_batch:
-                file.write("\n".join(batch) + "\n")
-                batch = []
-        if batch:
-            file.write("\n".join(batch) + "\n")
-
-
-def main(input_file, output_file, log_file, **kwargs):
+    # aligning the chunk sums usually leaves the index sorted already, so only sort when it isn't
+    if not allCoverage.index.is_monotonic_increasing:
+        allCoverage = allCoverage.sort_index()
+    # zstd threads are workers on top of the calling thread; 0 compresses in the calling thread
+    cctx = zstd.ZstdCompressor(level=3, threads=threads if threads > 1 else 0)
+    with zstd.open(output_file, "wt", cctx=cctx) as file:
+        allCoverage.to_csv(
+            file,
+            sep="\t",
+            float_format="%.4g",
+            index_label="Contig",
+            lineterminator="\n",
+            chunksize=lines_per_batch,
+        )
+
+
+def main(input_file, output_file, log_file, threads=1, **kwargs):
     # if kwargs["pyspy"]:
     #     subprocess.Popen(
     #         [
@@ -92,17 +110,20 @@ def main(input_file, output_file, log_file, **kwargs):
     #         ]
     #     )
     logging.basicConfig(filename=log_file, filemode="w", level=logging.DEBUG)
-    logging.debug("Collecting combined coverage stats")
+    logger.debug("Collecting combined coverage stats")
     allCoverage = collect_kmer_coverage_stats(input_file)
-    logging.debug("Printing all sample coverage")
-    print_kmer_coverage(allCoverage, output_file)
+    logger.debug("Printing all sample coverage")
+    print_kmer_coverage(allCoverage, output_file, threads=threads)
 
 
 if __name__ == "__main__":
+    inp = snakemake.input
+    log = snakemake.log
     main(
-        snakemake.input[0],
+        inp[0],
         snakemake.output.all_cov,
-        snakemake.log[0],
+        log[0],
+        threads=snakemake.threads,
         # pyspy=snakemake.params.pyspy,
-        # pyspy_svg=snakemake.log.pyspy,
+        # pyspy_svg=log.pyspy,
     )
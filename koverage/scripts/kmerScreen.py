@@ -21,6 +21,9 @@ import numpy as np
 import sys
 
 
+logger = logging.getLogger(__name__)
+
+
 def trimmed_variance(data, trim_frac=0.05):
     """Calculate the variance, minus the top x percent of outliers
 
@@ -112,7 +115,7 @@ def ref_kmer_parser_worker(
     """
     if jellyfish_db:
         cmd.append(jellyfish_db)
-    logging.debug(f"Starting interactive jellyfish session: {' '.join(cmd)}\n")
+    logger.debug("Starting interactive jellyfish session: %s\n", " ".join(cmd))
     pipe_jellyfish = subprocess.Popen(
         cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
     )
@@ -136,8 +139,8 @@ def ref_kmer_parser_worker(
     pipe_jellyfish.stdout.close()
     pipe_jellyfish.wait()
     if pipe_jellyfish.returncode != 0:
-        logging.debug(f"\nERROR: Jellyfish failure for:\n{' '.join(cmd)}\n")
-        logging.debug(f"STDERR: {pipe_jellyfish.stderr.read().decode()}")
+        logger.debug("\nERROR: Jellyfish failure for:\n%s\n", " ".join(cmd))
+        logger.debug("STDERR: %s", pipe_jellyfish.stderr.read().decode())
         sys.exit(1)
     out_queue.put(None)
 
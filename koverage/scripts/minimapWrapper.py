@@ -27,6 +27,9 @@ import zstandard as zstd
 import pickle
 
 
+logger = logging.getLogger(__name__)
+
+
 def worker_mm_to_count_paf_queues(pipe, count_queue, paf_queue):
     """Read minimap2 output and slot into queues for collecting coverage counts, and saving the paf file.
 
@@ -37,7 +40,6 @@ def worker_mm_to_count_paf_queues(pipe, count_queue, paf_queue):
     """
 
     for line in iter(pipe.stdout.readline, b""):
-        line = line.decode()
         count_queue.put(line)
         paf_queue.put(line)
 
@@ -54,7 +56,6 @@ def worker_mm_to_count_queues(pipe, count_queue):
     """
 
     for line in iter(pipe.stdout.readline, b""):
-        line = line.decode()
         count_queue.put(line)
 
     count_queue.put(None)
@@ -64,7 +65,7 @@ def worker_paf_writer(paf_queue, paf_dir, sample, chunk_size=100):
     """Read minimap2 output from queue and write to zstd-zipped file
 
     Args:
-        paf_queue (Queue): queue of minimap2 output for reading
+        paf_queue (Queue): queue of minimap2 output lines (bytes) for reading
         paf_dir (str): dir for saving paf files
     """
 
@@ -77,7 +78,7 @@ def worker_paf_writer(paf_queue, paf_dir, sample, chunk_size=100):
         line = paf_queue.get()
         if line is None:
             break
-        lines.append(line.encode())
+        lines.append(line)
         if len(lines) >= chunk_size:
             compressed_chunk = cctx.compress(b"".join(lines))
             output_f.write(compressed_chunk)
@@ -116,7 +117,7 @@ def worker_count_and_print(count_queue, contig_lengths, **kwargs):
     """Collect the counts from minimap2 queue and calc counts on the fly
 
     Args:
-        count_queue (Queue): queue of minimap2 output for reading
+        count_queue (Queue): queue of minimap2 output lines (bytes) for reading
         contig_lengths (list):
             0: Sequence ID (str)
             1: contig length (int)
@@ -132,7 +133,8 @@ def worker_count_and_print(count_queue, contig_lengths, **kwargs):
         line = count_queue.get()
         if line is None:
             break
-        l = line.strip().split()
+        # only the target ID and start columns are needed, leave the rest of the line unsplit
+        l = line.split(b"\t", 8)
         contig_bin_counts[int(l[5]), int(int(l[7]) / kwargs["bin_width"])] += 1
 
     with open(kwargs["output_counts"], "wb") as handle:
@@ -228,7 +230,7 @@ def main(**kwargs):
     )
 
     mm2cmd = build_mm2cmd(**kwargs)
-    logging.debug(f"Starting minimap2: {' '.join(mm2cmd)}\n")
+    logger.debug("Starting minimap2: %s\n", " ".join(mm2cmd))
     pipe_minimap = subprocess.Popen(
         mm2cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
     )
@@ -263,8 +265,8 @@ def main(**kwargs):
     pipe_minimap.stdout.close()
     pipe_minimap.wait()
     if pipe_minimap.returncode != 0:
-        logging.debug(f"\nERROR: Pipe failure for:\n{' '.join(mm2cmd)}\n")
-        logging.debug(f"STDERR: {pipe_minimap.stderr.read().decode()}")
+        logger.debug("\nERROR: Pipe failure for:\n%s\n", " ".join(mm2cmd))
+        logger.debug("STDERR: %s", pipe_minimap.stderr.read().decode())
         sys.exit(1)
 
     # Join reader
@@ -4,7 +4,12 @@
 
 This script will parse the raw count summary for a sample and calculate the output coverage stats for each contig.
 
-- `calculate_coverage_stats_from_counts` - Read in the library size and the counts from minimapWrapper.py, calculate rpm, rpkm, and rpk, write the counts
+- `calculate_bin_stats` - Calculate the mean, median, hitrate, and variance of the bin counts for each contig
+- `bin_stat_blocks` - Group contigs with similar numbers of bins into bounded blocks for calculating bin stats
+- `scale_counts` - Calculate the rpm, rpkm, rpk, and tpm from the read counts
+- `calculate_coverage_stats_from_counts` - Read in the library size and the counts from minimapWrapper.py, calculate rpm, rpkm, and rpk
+- `write_fd` - Write bytes to a raw file descriptor
+- `print_coverage_stats` - Print the coverage stats for each contig
 """
 
 
@@ -13,16 +18,129 @@ import os
 import subprocess
 import pickle
 import numpy as np
+from collections import namedtuple
+
+
+logger = logging.getLogger(__name__)
+
+
+CoverageArrays = namedtuple(
+    "CoverageArrays",
+    [
+        "contigs",
+        "count",
+        "rpm",
+        "rpkm",
+        "rpk",
+        "tpm",
+        "mean",
+        "median",
+        "hitrate",
+        "variance",
+    ],
+)
+
+
+def calculate_bin_stats(contig_bin_counts, max_bins):
+    """Calculate the mean, median, hitrate, and variance of the bin counts within each contig
+
+    Args:
+        contig_bin_counts (np.array): bin counts, row = contig, col = bin
+        max_bins (np.array): number of bins that fall within each contig
+
+    Returns:
+        means (np.array): mean bin count for each contig
+        medians (np.array): median bin count for each contig
+        hitrates (np.array): fraction of bins with a nonzero count for each contig
+        variances (np.array): variance of bin counts for each contig
+    """
+    # only bins that fall within each contig contribute to its bin stats
+    in_contig = np.arange(contig_bin_counts.shape[1]) < max_bins[:, None]
+    binned = np.where(in_contig, contig_bin_counts, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.sum(binned, axis=1) / max_bins
+        hitrates = np.count_nonzero(binned, axis=1) / max_bins
+        sq_dev = np.where(in_contig, (binned - means[:, None]) ** 2, 0)
+        variances = np.sum(sq_dev, axis=1) / (max_bins - 1)
+    variances[max_bins < 1] = np.nan
+
+    # out-of-contig bins are padded to sort to the end, the median is taken from the first max_bins
+    padding = np.iinfo(contig_bin_counts.dtype).max
+    sorted_bins = np.sort(np.where(in_contig, contig_bin_counts, padding), axis=1)
+    lower = np.take_along_axis(sorted_bins, ((max_bins - 1) // 2)[:, None], axis=1)
+    upper = np.take_along_axis(sorted_bins, (max_bins // 2)[:, None], axis=1)
+    medians = (lower[:, 0].astype(np.float64) + upper[:, 0]) / 2
+    medians[max_bins < 1] = np.nan
+
+    return means, medians, hitrates, variances
+
+
+def bin_stat_blocks(max_bins, block_cells=1048576):
+    """Group contigs with similar numbers of bins into blocks for calculate_bin_stats()
+
+    Args:
+        max_bins (np.array): number of bins that fall within each contig
+        block_cells (int): maximum size of a block (rows x bins of its longest contig)
+
+    Returns:
+        blocks (list):
+            0: contig row indices (np.array)
+            1: number of bins to slice for the block (int)
+    """
+    order = np.argsort(max_bins, kind="stable")
+    sorted_bins = np.maximum(max_bins[order], 1).astype(np.int64)
+    blocks = []
+    start = 0
+    while start < len(order):
+        # contigs are sorted by bins, so the last row of a block is its widest
+        rows = max(1, block_cells // sorted_bins[start])
+        while (
+            rows > 1
+            and rows * sorted_bins[min(start + rows, len(order)) - 1] > block_cells
+        ):
+            rows //= 2
+        end = min(start + rows, len(order))
+        blocks.append((order[start:end], sorted_bins[end - 1]))
+        start = end
+    return blocks
+
+
+def scale_counts(sums, contiglens):
+    """Calculate the rpm, rpkm, rpk, and tpm for each contig from the read counts
+
+    Args:
+        sums (np.array): read counts for each contig
+        contiglens (np.array): contig lengths
+
+    Returns:
+        rpm (np.array): reads per million
+        rpkm (np.array): reads per kilobase million
+        rpk (np.array): reads per kilobase
+        tpm (np.array): transcripts per million
+    """
+    rpmscale = np.sum(sums) / 1000000
+    # multiply by reciprocals rather than dividing each contig; empty libraries scale to zero
+    inv_rpm = 1.0 / rpmscale if rpmscale > 0 else 0.0
+    inv_contiglenkb = 1000 / contiglens
+    rpm = sums * inv_rpm
+    rpkm = rpm * inv_contiglenkb
+    rpk = sums * inv_contiglenkb
+    rpk_scale = np.sum(rpk) / 1000000
+    inv_rpk = 1.0 / rpk_scale if rpk_scale > 0 else 0.0
+    tpm = rpk * inv_rpk
+    return rpm, rpkm, rpk, tpm
 
 
 def calculate_coverage_stats_from_counts(**kwargs):
-    """Read in the library size and the counts from minimapWrapper.py, calculate rpm, rpkm, and rpk, write counts for sample
+    """Read in the library size and the counts from minimapWrapper.py, calculate rpm, rpkm, and rpk
 
     Kwargs:
         count_file (str): filepath to pickle file of contig lengths and np.array count objects
         bin_width (int): bin width size
-        output_file (str): filepath of ouptut file for writing
-        sample (str): sample name
+
+    Returns:
+        coverage (CoverageArrays): parallel arrays of contig IDs and their coverage stats, one element per contig
     """
 
     with open(kwargs["count_file"], "rb") as handle:
@@ -32,56 +150,80 @@ def calculate_coverage_stats_from_counts(**kwargs):
         contig_bin_counts = pickle.load(handle)
 
     contiglens = np.array([row[1] for row in contig_lengths], dtype=np.int32)
-    contiglenkb = contiglens / 1000
 
     sums = np.sum(contig_bin_counts, axis=1)
-    means = np.zeros(len(contiglens))
-    medians = np.zeros(len(contiglens))
-    hitrates = np.zeros(len(contiglens))
-    variances = np.zeros(len(contiglens))
-
-    for c in range(len(contiglens)):
-        maxBin = int(contiglens[c] / kwargs["bin_width"])
-        means[c] = np.mean(contig_bin_counts[c, 0:maxBin])
-        medians[c] = np.median(contig_bin_counts[c, 0:maxBin])
-        hitrates[c] = np.sum(contig_bin_counts[c, 0:maxBin] != 0) / maxBin
-        variances[c] = np.var(contig_bin_counts[c, 0:maxBin], ddof=1)
-
-    lib_size = np.sum(sums)
-    rpmscale = lib_size / 1000000
-
-    rpm = sums / rpmscale
-    rpkm = rpm / contiglenkb
-    rpk = sums / contiglenkb
-    rpk_scale = np.sum(rpk) / 1000000
-    if rpk_scale > 0:
-        tpm = rpk / rpk_scale
-    else:
-        tpm = np.zeros(len(contiglens))
+    max_bins = contiglens // kwargs["bin_width"]
+
+    means = np.empty(len(contiglens))
+    medians = np.empty(len(contiglens))
+    hitrates = np.empty(len(contiglens))
+    variances = np.empty(len(contiglens))
+
+    for rows, width in bin_stat_blocks(max_bins):
+        stats = calculate_bin_stats(contig_bin_counts[rows, :width], max_bins[rows])
+        means[rows], medians[rows], hitrates[rows], variances[rows] = stats
+
+    rpm, rpkm, rpk, tpm = scale_counts(sums, contiglens)
 
     variances = np.nan_to_num(variances, nan=0)
-    rpm = np.nan_to_num(rpm, nan=0)
-    rpkm = np.nan_to_num(rpkm, nan=0)
-
-    with open(kwargs["output_file"], "w") as o:
-        for c in range(len(contiglens)):
-            o.write(
-                "\t".join(
-                    [
-                        kwargs["sample"],
-                        contig_lengths[c][0],
-                        "{:d}".format(int(sums[c])),
-                        "{:.{}g}".format(rpm[c], 4),
-                        "{:.{}g}".format(rpkm[c], 4),
-                        "{:.{}g}".format(rpk[c], 4),
-                        "{:.{}g}".format(tpm[c], 4),
-                        "{:.{}g}".format(means[c], 4),
-                        "{:.{}g}".format(medians[c], 4),
-                        "{:.{}g}".format(hitrates[c], 4),
-                        "{:.{}g}".format(variances[c], 4) + "\n",
-                    ]
-                )
+
+    return CoverageArrays(
+        contigs=[row[0] for row in contig_lengths],
+        count=sums,
+        rpm=rpm,
+        rpkm=rpkm,
+        rpk=rpk,
+        tpm=tpm,
+        mean=means,
+        median=medians,
+        hitrate=hitrates,
+        variance=variances,
+    )
+
+
+def write_fd(fd, data):
+    """Write bytes to a raw file descriptor, retrying short writes
+
+    Args:
+        fd (int): open file descriptor for writing
+        data (bytes): encoded output for writing
+    """
+    with memoryview(data) as view:
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+
+
+def print_coverage_stats(coverage, lines_per_batch=4096, **kwargs):
+    """Print the coverage stats from calculate_coverage_stats_from_counts()
+
+    Args:
+        coverage (CoverageArrays): parallel arrays of contig IDs and their coverage stats
+        lines_per_batch (int): Number of lines to write at a time
+
+    Kwargs:
+        output_file (str): filepath of ouptut file for writing
+        sample (str): sample name
+    """
+    sample = kwargs["sample"]
+    fd = os.open(kwargs["output_file"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        batch = []
+        # tolist() converts each column to python numbers once, instead of per-value numpy scalars
+        for contig, count, rpm, rpkm, rpk, tpm, mean, median, hitrate, variance in zip(
+            coverage.contigs, *(column.tolist() for column in coverage[1:])
+        ):
+            batch.append(
+                f"{sample}\t{contig}\t{count}\t{rpm:.4g}\t{rpkm:.4g}\t{rpk:.4g}\t{tpm:.4g}\t"
+                f"{mean:.4g}\t{median:.4g}\t{hitrate:.4g}\t{variance:.4g}\n"
             )
+            if len(batch) >= lines_per_batch:
+                write_fd(fd, "".join(batch).encode())
+                batch = []
+        if batch:
+            write_fd(fd, "".join(batch).encode())
+    finally:
+        os.close(fd)
 
 
 def main(**kwargs):
@@ -98,18 +240,22 @@ def main(**kwargs):
     #         ]
     #     )
     logging.basicConfig(filename=kwargs["log_file"], filemode="w", level=logging.DEBUG)
-    logging.debug("Reading in library size")
-    calculate_coverage_stats_from_counts(**kwargs)
-    logging.debug("Calculating TPMs and printing")
+    logger.debug("Calculating coverage stats")
+    coverage = calculate_coverage_stats_from_counts(**kwargs)
+    logger.debug("Printing coverage stats")
+    print_coverage_stats(coverage, **kwargs)
 
 
 if __name__ == "__main__":
+    inp = snakemake.input
+    log = snakemake.log
+    params = snakemake.params
     main(
-        count_file=snakemake.input.counts,
-        log_file=snakemake.log[0],
+        count_file=inp.counts,
+        log_file=log[0],
         output_file=snakemake.output[0],
         sample=snakemake.wildcards.sample,
-        bin_width=snakemake.params.binwidth,
-        # pyspy=snakemake.params.pyspy,
-        # pyspy_svg=snakemake.log.pyspy,
+        bin_width=params.binwidth,
+        # pyspy=params.pyspy,
+        # pyspy_svg=log.pyspy,
     )
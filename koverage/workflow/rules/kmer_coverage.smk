@@ -112,7 +112,12 @@ rule combine_kmer_coverage:
         all_cov = config["allkmers"]
     # params:
     #     pyspy = config["args"]["pyspy"]
-    threads: 1
+    threads:
+        resources["med"]["cpu"]
+    resources:
+        mem_mb = resources["med"]["mem"],
+        mem = str(resources["med"]["mem"]) + "MB",
+        time = resources["med"]["time"]
     log:
         err = os.path.join(dir["log"], "combine_kmer_coverage.err"),
         # pyspy = os.path.join(dir["log"], "combine_kmer_coverage.svg")
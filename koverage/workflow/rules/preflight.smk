@@ -41,7 +41,7 @@ dir["bench"] = os.path.join(dir["out"], "benchmarks")
 
 config["refkmers"] = os.path.join(dir["temp"], os.path.basename(config["args"]["ref"]) + "." + str(config["args"]["kmer_size"]) + "mer.zst")
 config["samplekmers"] = os.path.join(dir["result"], "sample_kmer_coverage." + str(config["args"]["kmer_size"]) + "mer.tsv.gz")
-config["allkmers"] = os.path.join(dir["result"], "all_kmer_coverage." + str(config["args"]["kmer_size"]) + "mer.tsv.gz")
+config["allkmers"] = os.path.join(dir["result"], "all_kmer_coverage." + str(config["args"]["kmer_size"]) + "mer.tsv.zst")
 
 
 # PARSE SAMPLES
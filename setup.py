@@ -60,7 +60,9 @@ setup(
         "pyyaml>=6.0",
         "Click>=8.1.3",
         "zstandard>=0.21.0",
+        "isal>=1.0.0",
         "numpy>=1.24.3",
+        "pandas>=1.5.0",
         # "py-spy>=0.3.14",
         "datapane>=0.16.7",
         "plotly>=5.15.0",
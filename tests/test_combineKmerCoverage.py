@@ -1,4 +1,7 @@
 import gzip
+import pytest
+import pandas as pd
+import zstandard as zstd
 import koverage.scripts.combineKmerCoverage as ckc
 
 
@@ -12,25 +15,48 @@ def test_collect_kmer_coverage_stats(tmp_path):
             "sample\tcontig2\t20\t1.0\t2.5\t1.5\t1.8\n"
         )
     expected_result = {
-        "contig1": {"sum": 10, "mean": 0.5, "median": 1.25},
-        "contig2": {"sum": 20, "mean": 1.0, "median": 2.5},
+        "contig1": {"Sum": 10, "Mean": 0.5, "Median": 1.25},
+        "contig2": {"Sum": 20, "Mean": 1.0, "Median": 2.5},
     }
     result = ckc.collect_kmer_coverage_stats(input_file)
-    assert result == expected_result
+    assert result.to_dict(orient="index") == expected_result
+    result = ckc.collect_kmer_coverage_stats(input_file, chunk_size=1)
+    assert result.to_dict(orient="index") == expected_result
 
 
-def test_print_kmer_coverage(tmp_path):
-    output_file = tmp_path / "test_output.txt.gz"
-    all_coverage = {
-        "contig1": {"sum": 10, "mean": 0.5, "median": 1.25},
-        "contig2": {"sum": 20, "mean": 1.0, "median": 2.5},
-        "contig3": {"sum": 20, "mean": 1.0, "median": 2.5},
-    }
-    ckc.print_kmer_coverage(all_coverage, output_file, lines_per_batch=2)
-    with gzip.open(output_file, "rt") as file:
+@pytest.mark.parametrize("threads", [1, 2])
+def test_print_kmer_coverage(tmp_path, threads):
+    output_file = tmp_path / "test_output.txt.zst"
+    all_coverage = pd.DataFrame(
+        [[20, 1.0, 2.5], [10, 0.5, 1.25], [20, 1.0, 2.5]],
+        index=["contig2", "contig1", "contig3"],
+        columns=["Sum", "Mean", "Median"],
+    )
+    ckc.print_kmer_coverage(
+        all_coverage, output_file, lines_per_batch=2, threads=threads
+    )
+    with zstd.open(output_file, "rt") as file:
         lines = file.readlines()
         assert len(lines) == 4
         assert lines[0] == "Contig\tSum\tMean\tMedian\n"
         assert lines[1] == "contig1\t10\t0.5\t1.25\n"
         assert lines[2] == "contig2\t20\t1\t2.5\n"
         assert lines[3] == "contig3\t20\t1\t2.5\n"
+
+
+def test_main(tmp_path):
+    input_file = tmp_path / "test_input.txt.gz"
+    output_file = tmp_path / "test_output.txt.zst"
+    log_file = tmp_path / "test.log"
+    with gzip.open(input_file, "wt") as f:
+        f.write(
+            "Sample\tContig\tSum\tMean\tMedian\tHitrate\tVariance\n"
+            "sample1\tcontig1\t5\t0.25\t0.25\t0.25\t0.9\n"
+            "sample2\tcontig1\t5\t0.25\t1\t0.5\t0\n"
+        )
+    ckc.main(input_file, output_file, log_file)
+    with zstd.open(output_file, "rt") as file:
+        assert file.readlines() == [
+            "Contig\tSum\tMean\tMedian\n",
+            "contig1\t10\t0.5\t1.25\n",
+        ]
@@ -32,14 +32,14 @@ def fasta_lens():
 @pytest.fixture
 def minimap_pipe():
     out = [
-        "col1\tcol2\tcol3\tcol4\tcol5\t0\t50\t25\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t0\t50\t25\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t0\t50\t25\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t1\t125\t25\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t1\t125\t125\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t2\t100\t25\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t2\t100\t25\tcol9\tcol10\tcol11\tcol12\n",
-        "col1\tcol2\tcol3\tcol4\tcol5\t2\t100\t75\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t0\t50\t25\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t0\t50\t25\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t0\t50\t25\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t1\t125\t25\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t1\t125\t125\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t2\t100\t25\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t2\t100\t25\tcol9\tcol10\tcol11\tcol12\n",
+        b"col1\tcol2\tcol3\tcol4\tcol5\t2\t100\t75\tcol9\tcol10\tcol11\tcol12\n",
     ]
     return out
 
@@ -61,12 +61,12 @@ def test_worker_mm_to_count_paf_queues():
         b"",
     ]
     worker_mm_to_count_paf_queues(pipe, count_queue, paf_queue)
-    assert count_queue.get() == "line1\n"
-    assert paf_queue.get() == "line1\n"
-    assert count_queue.get() == "line2\n"
-    assert paf_queue.get() == "line2\n"
-    assert count_queue.get() == "line3\n"
-    assert paf_queue.get() == "line3\n"
+    assert count_queue.get() == b"line1\n"
+    assert paf_queue.get() == b"line1\n"
+    assert count_queue.get() == b"line2\n"
+    assert paf_queue.get() == b"line2\n"
+    assert count_queue.get() == b"line3\n"
+    assert paf_queue.get() == b"line3\n"
     assert count_queue.get() is None
     assert paf_queue.get() is None
 
@@ -81,9 +81,9 @@ def test_worker_mm_to_count_queues():
         b"",
     ]
     worker_mm_to_count_queues(pipe, count_queue)
-    assert count_queue.get() == "line1\n"
-    assert count_queue.get() == "line2\n"
-    assert count_queue.get() == "line3\n"
+    assert count_queue.get() == b"line1\n"
+    assert count_queue.get() == b"line2\n"
+    assert count_queue.get() == b"line3\n"
     assert count_queue.get() is None
 
 
@@ -92,9 +92,9 @@ def test_worker_paf_writer(tmp_path):
     paf_dir = tmp_path / "output"
     sample = "sample"
     paf_file = os.path.join(paf_dir, sample + ".paf.zst")
-    paf_queue.put("line1\n")
-    paf_queue.put("line2\n")
-    paf_queue.put("line3\n")
+    paf_queue.put(b"line1\n")
+    paf_queue.put(b"line2\n")
+    paf_queue.put(b"line3\n")
     paf_queue.put(None)
     worker_paf_writer(paf_queue, paf_dir, sample)
     with open(paf_file, "rb") as f:
@@ -118,9 +118,9 @@ def test_worker_paf_writer_chunksize(tmp_path):
     paf_dir = tmp_path / "output"
     sample = "sample"
     paf_file = os.path.join(paf_dir, sample + ".paf.zst")
-    paf_queue.put("line1\n")
-    paf_queue.put("line2\n")
-    paf_queue.put("line3\n")
+    paf_queue.put(b"line1\n")
+    paf_queue.put(b"line2\n")
+    paf_queue.put(b"line3\n")
     paf_queue.put(None)
     worker_paf_writer(paf_queue, paf_dir, sample, chunk_size=2)
     dctx = zstd.ZstdDecompressor()
@@ -6,7 +6,11 @@ import os
 from unittest.mock import mock_open, patch, call
 
 from koverage.scripts.sampleCoverage import (
+    bin_stat_blocks,
     calculate_coverage_stats_from_counts,
+    print_coverage_stats,
+    scale_counts,
+    write_fd,
 )
 
 
@@ -68,7 +72,8 @@ def test_calculate_coverage_stats_from_counts(
 ):
     dump_pickle(contig_lens, contig_bin_counts, **kwarguments)
 
-    calculate_coverage_stats_from_counts(**kwarguments)
+    coverage = calculate_coverage_stats_from_counts(**kwarguments)
+    print_coverage_stats(coverage, **kwarguments)
 
     with open(kwarguments["output_file"], "r") as output_file:
         actual_output = output_file.readlines()
@@ -80,9 +85,71 @@ def test_empty_coverage_stats_from_counts(contig_lens, kwarguments, count_empty_
     contig_bin_counts = np.zeros([3, 10], dtype=np.int32)
     dump_pickle(contig_lens, contig_bin_counts, **kwarguments)
 
-    calculate_coverage_stats_from_counts(**kwarguments)
+    coverage = calculate_coverage_stats_from_counts(**kwarguments)
+    print_coverage_stats(coverage, **kwarguments)
 
     with open(kwarguments["output_file"], "r") as output_file:
         actual_output = output_file.readlines()
 
     assert actual_output == count_empty_output
+
+
+def test_coverage_arrays_from_counts(contig_lens, contig_bin_counts, kwarguments):
+    dump_pickle(contig_lens, contig_bin_counts, **kwarguments)
+
+    coverage = calculate_coverage_stats_from_counts(**kwarguments)
+
+    assert coverage.contigs == ["contig1", "contig2", "contig3"]
+    assert coverage.count.tolist() == [1, 6, 31]
+    assert np.allclose(coverage.rpk, [1, 1.2, 3.1])
+    assert np.allclose(coverage.median, [1, 1, 1.5])
+    assert np.allclose(coverage.hitrate, [1, 1, 0.9])
+
+
+def test_print_coverage_stats_batches(
+    contig_lens, contig_bin_counts, kwarguments, count_expected_output
+):
+    dump_pickle(contig_lens, contig_bin_counts, **kwarguments)
+
+    coverage = calculate_coverage_stats_from_counts(**kwarguments)
+    print_coverage_stats(coverage, lines_per_batch=2, **kwarguments)
+
+    with open(kwarguments["output_file"], "r") as output_file:
+        actual_output = output_file.readlines()
+
+    assert actual_output == count_expected_output
+
+
+def test_write_fd(tmp_path):
+    out_file = tmp_path / "out.tsv"
+    fd = os.open(out_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    write_fd(fd, b"line1\n")
+    write_fd(fd, b"line2\n")
+    os.close(fd)
+
+    with open(out_file, "rb") as in_fh:
+        assert in_fh.read() == b"line1\nline2\n"
+
+
+def test_scale_counts():
+    sums = np.array([1, 6, 31], dtype=np.int64)
+    contiglens = np.array([1000, 5000, 10000], dtype=np.int32)
+    rpm, rpkm, rpk, tpm = scale_counts(sums, contiglens)
+    assert np.allclose(rpm, [2.632e04, 1.579e05, 8.158e05], rtol=1e-3)
+    assert np.allclose(rpkm, [2.632e04, 3.158e04, 8.158e04], rtol=1e-3)
+    assert np.allclose(rpk, [1, 1.2, 3.1])
+    assert np.allclose(tpm, [1.887e05, 2.264e05, 5.849e05], rtol=1e-3)
+    rpm, rpkm, rpk, tpm = scale_counts(np.zeros(3, dtype=np.int64), contiglens)
+    assert not np.any(tpm)
+
+
+def test_bin_stat_blocks():
+    max_bins = np.array([20000, 1, 0, 5, 5, 100, 3], dtype=np.int32)
+
+    blocks = bin_stat_blocks(max_bins, block_cells=12)
+
+    rows = np.concatenate([block[0] for block in blocks])
+    assert sorted(rows.tolist()) == list(range(len(max_bins)))
+    for block_rows, width in blocks:
+        assert width == max(np.max(max_bins[block_rows]), 1)
+        assert len(block_rows) == 1 or len(block_rows) * width <= 12